@@ -1,11 +1,22 @@
-from functools import lru_cache
+import os
 from typing import Optional, Literal
 
 from dotenv import load_dotenv
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-load_dotenv()
+# В production переменные окружения передаются напрямую, .env не читается
+ENV_FILE: Optional[str] = (
+    ".env"
+    if os.environ.get("ENVIRONMENT") != "production" and os.path.exists(".env")
+    else None
+)
+
+if ENV_FILE:
+    load_dotenv(ENV_FILE)
+
+# Жесткий верхний предел пула Redis
+REDIS_MAX_CONNECTIONS_LIMIT = 1000
 
 
 class Settings(BaseSettings):
@@ -26,7 +37,17 @@ class Settings(BaseSettings):
     POSTGRES_MAX_OVERFLOW: int = Field(default=10, description="PostgreSQL max overflow connections")
     POSTGRES_POOL_TIMEOUT: int = Field(default=30, description="PostgreSQL pool timeout")
     POSTGRES_ECHO: bool = Field(default=False, description="Echo PostgreSQL queries")
+    POSTGRES_QUERY_CACHE_SIZE: int = Field(default=1200, description="SQLAlchemy compiled query cache size")
     POSTGRES_POOL_PRE_PING: bool = Field(default=True, description="Pre-ping PostgreSQL connections")
+    POSTGRES_POOL_RECYCLE: int = Field(default=1800, description="PostgreSQL connection recycle time in seconds")
+    POSTGRES_CONNECT_TIMEOUT: int = Field(default=10, description="PostgreSQL connect timeout")
+    POSTGRES_COMMAND_TIMEOUT: int = Field(default=60, description="PostgreSQL command timeout")
+    POSTGRES_KEEPALIVE_IDLE: int = Field(default=60, description="PostgreSQL server-side TCP keepalive idle time in seconds")
+    POSTGRES_KEEPALIVE_INTVL: int = Field(default=10, description="PostgreSQL server-side TCP keepalive interval in seconds")
+    POSTGRES_KEEPALIVE_COUNT: int = Field(default=5, description="PostgreSQL server-side TCP keepalive probes count")
+    POSTGRES_PREWARM: bool = Field(default=True, description="Open pool_size connections on startup")
+    POSTGRES_USE_FAST_POOL: bool = Field(default=False, description="Use fixed-size lock-free FastAsyncPool")
+    POSTGRES_USE_PGBOUNCER: bool = Field(default=False, description="Connect through PgBouncer in transaction mode")
 
     # Redis
     REDIS_HOST: str = Field(default="localhost", description="Redis host")
@@ -36,12 +57,14 @@ class Settings(BaseSettings):
     REDIS_MAX_CONNECTIONS: int = Field(default=20, description="Redis max connections")
     REDIS_SOCKET_TIMEOUT: int = Field(default=5, description="Redis socket timeout")
     REDIS_SOCKET_CONNECT_TIMEOUT: int = Field(default=5, description="Redis socket connect timeout")
+    REDIS_POOL_TIMEOUT: int = Field(default=5, description="Redis pool wait timeout when all connections are busy")
 
     # Security
     SECRET_KEY: str = Field(
         default="your-secret-key-here-change-in-production",
         description="Secret key for JWT tokens",
-        min_length=32
+        min_length=32,
+        validate_default=True
     )
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, description="Access token expiration in minutes")
 
@@ -67,15 +90,37 @@ class Settings(BaseSettings):
             raise ValueError("SECRET_KEY должен быть не менее 32 символов в production")
         return v
 
+    @field_validator('REDIS_MAX_CONNECTIONS')
+    @classmethod
+    def validate_redis_max_connections(cls, v: int):
+        """
+        Ограничение размера пула Redis
+
+        Без верхней границы ошибка в цикле может открыть тысячи соединений
+        и нагрузить Redis настолько, что он перестанет обслуживать остальных клиентов
+        """
+        if not 1 <= v <= REDIS_MAX_CONNECTIONS_LIMIT:
+            raise ValueError(
+                f"REDIS_MAX_CONNECTIONS должен быть в диапазоне 1..{REDIS_MAX_CONNECTIONS_LIMIT}"
+            )
+        return v
+
     model_config = SettingsConfigDict(
-        env_file=".env",
+        env_file=ENV_FILE,
         env_file_encoding="utf-8",
         case_sensitive=True,
-        extra="ignore"
+        extra="ignore",
+        validate_default=False,
+        frozen=True
     )
 
 
-@lru_cache(maxsize=1)
+_SETTINGS: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
     """Получение настроек приложения (синглтон)"""
-    return Settings()
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = Settings()
+    return _SETTINGS
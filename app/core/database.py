@@ -1,24 +1,32 @@
+import asyncio
 import logging
-from asyncio import current_task
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional
+from uuid import uuid4
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
     create_async_engine,
     async_sessionmaker,
-    async_scoped_session
 )
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 
 from app.core.config import get_settings
+from app.core.fast_pool import FastAsyncPool
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
-# Базовый класс для моделей
-Base = declarative_base()
+# Запрос проверки здоровья (создается один раз)
+_HEALTH_STMT = text("SELECT 1")
+
+
+class Base(DeclarativeBase):
+    """Базовый класс для моделей"""
 
 
 class DatabaseManager:
@@ -27,9 +35,70 @@ class DatabaseManager:
     def __init__(self):
         self.engine: Optional[AsyncEngine] = None
         self.session_factory: Optional[async_sessionmaker] = None
-        self.scoped_session: Optional[async_scoped_session] = None
         self._initialized = False
 
+    @staticmethod
+    def _get_engine_options() -> dict[str, Any]:
+        """
+        Параметры пула и драйвера в зависимости от режима подключения
+
+        | Режим                  | Пул                   | Prepared statements |
+        |------------------------|-----------------------|---------------------|
+        | Прямое подключение     | AsyncAdaptedQueuePool | кэшируются asyncpg  |
+        | PgBouncer (transaction)| NullPool              | кэш отключен        |
+        | POSTGRES_USE_FAST_POOL | FastAsyncPool         | кэшируются asyncpg  |
+
+        QueuePool дает максимальную пропускную способность при прямом
+        подключении к PostgreSQL. За PgBouncer пулинг на стороне приложения
+        избыточен, а кэш prepared statements asyncpg приводит к
+        DuplicatePreparedStatementError, поэтому используется NullPool, кэш отключен,
+        а имена prepared statements генерируются через uuid4.
+        server_settings в этом режиме не передаются: PgBouncer по умолчанию отклоняет
+        неизвестные startup-параметры (например, jit), если они не перечислены
+        в ignore_startup_parameters.
+        FastAsyncPool - пул фиксированного размера без overflow и блокировок threading.
+        """
+        if settings.POSTGRES_USE_PGBOUNCER:
+            return {
+                "poolclass": NullPool,
+                "connect_args": {
+                    "timeout": settings.POSTGRES_CONNECT_TIMEOUT,
+                    "command_timeout": settings.POSTGRES_COMMAND_TIMEOUT,
+                    "statement_cache_size": 0,
+                    "prepared_statement_cache_size": 0,
+                    # Уникальные имена prepared statements, чтобы они не пересекались
+                    # на одном серверном соединении PgBouncer
+                    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+                },
+            }
+
+        if settings.POSTGRES_USE_FAST_POOL:
+            pool_options = {"poolclass": FastAsyncPool}
+        else:
+            pool_options = {"max_overflow": settings.POSTGRES_MAX_OVERFLOW}
+
+        return {
+            **pool_options,
+            "pool_size": settings.POSTGRES_POOL_SIZE,
+            "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+            "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+            "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+            "connect_args": {
+                "timeout": settings.POSTGRES_CONNECT_TIMEOUT,
+                "command_timeout": settings.POSTGRES_COMMAND_TIMEOUT,
+                # TCP keepalive на стороне сервера: PostgreSQL обнаруживает и закрывает
+                # соединения умерших клиентов. Мертвые соединения к серверу на стороне
+                # приложения обнаруживает только pool_pre_ping
+                "server_settings": {
+                    "application_name": "fastapi-core",
+                    "jit": "off",
+                    "tcp_keepalives_idle": str(settings.POSTGRES_KEEPALIVE_IDLE),
+                    "tcp_keepalives_interval": str(settings.POSTGRES_KEEPALIVE_INTVL),
+                    "tcp_keepalives_count": str(settings.POSTGRES_KEEPALIVE_COUNT),
+                },
+            },
+        }
+
     async def initialize(self):
         """Инициализация подключения к базе данных"""
         if self._initialized:
@@ -41,12 +110,14 @@ class DatabaseManager:
             self.engine = create_async_engine(
                 settings.POSTGRES_DSN,
                 echo=settings.POSTGRES_ECHO,
-                pool_size=settings.POSTGRES_POOL_SIZE,
-                max_overflow=settings.POSTGRES_MAX_OVERFLOW,
-                pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
-                pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+                query_cache_size=settings.POSTGRES_QUERY_CACHE_SIZE,
+                **self._get_engine_options(),
             )
 
+            # Предварительное открытие соединений пула
+            if settings.POSTGRES_PREWARM and not settings.POSTGRES_USE_PGBOUNCER:
+                await self._prewarm_pool()
+
             # Создание фабрики сессий
             self.session_factory = async_sessionmaker(
                 self.engine,
@@ -56,19 +127,35 @@ class DatabaseManager:
                 autoflush=False,
             )
 
-            # Создание scoped session
-            self.scoped_session = async_scoped_session(
-                self.session_factory,
-                scopefunc=current_task,
-            )
-
             self._initialized = True
             logger.info("Database успешно инициализирован")
 
         except Exception as e:
-            logger.error(f"Ошибка инициализации database: {e}")
+            logger.error("Ошибка инициализации database: %s", e)
+            if self.engine:
+                await self.engine.dispose()
+                self.engine = None
             raise
 
+    async def _prewarm_pool(self):
+        """Открытие pool_size соединений при старте, чтобы первые запросы не платили за handshake"""
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.engine.connect() for _ in range(settings.POSTGRES_POOL_SIZE)),
+            return_exceptions=True,
+        )
+        connections = [r for r in results if not isinstance(r, BaseException)]
+        await asyncio.gather(*(conn.close() for conn in connections))
+
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+        logger.info(
+            "Database пул прогрет: %d соединений за %.3fs",
+            len(connections),
+            time.perf_counter() - started,
+        )
+
     async def close(self):
         """Закрытие всех подключений"""
         if self.engine:
@@ -88,7 +175,7 @@ class DatabaseManager:
             await session.commit()
         except Exception as e:
             await session.rollback()
-            logger.error(f"Ошибка сессии database: {e}")
+            logger.error("Ошибка сессии database: %s", e)
             raise
         finally:
             await session.close()
@@ -97,10 +184,10 @@ class DatabaseManager:
         """Проверка здоровья подключения"""
         try:
             async with self.get_session() as session:
-                await session.execute("SELECT 1")
+                await session.execute(_HEALTH_STMT)
             return True
         except Exception as e:
-            logger.error(f"Database health check failed: {e}")
+            logger.error("Database health check failed: %s", e)
             return False
 
 
@@ -117,5 +204,17 @@ def get_db_manager() -> DatabaseManager:
 # Функция для внедрения зависимости
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency для получения сессии базы данных"""
-    async with db_manager.get_session() as session:
+    # Сессия создается напрямую, без вложенного контекстного менеджера get_session()
+    if not db_manager._initialized:
+        raise RuntimeError("Database не инициализирован. Вызовите initialize()")
+
+    session: AsyncSession = db_manager.session_factory()
+    try:
         yield session
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        logger.error("Ошибка сессии database: %s", e)
+        raise
+    finally:
+        await session.close()
@@ -0,0 +1,123 @@
+import asyncio
+from collections import deque
+from contextlib import suppress
+from typing import Any, Deque
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, ConnectionPoolEntry
+from sqlalchemy.util import await_only
+
+
+class FastAsyncPool(Pool):
+    """
+    Пул соединений фиксированного размера для asyncio
+
+    Свободные соединения хранятся в deque. Ожидающие получают соединения в порядке FIFO:
+    у каждого свой future, и освобожденное соединение передается напрямую самому
+    старому из них, не пробуждая остальных.
+    Каждый worker выполняет event loop в одном потоке, поэтому пулу не нужны
+    блокировки threading и счетчик overflow, как в AsyncAdaptedQueuePool.
+    Соединения выдаются в порядке LIFO, чтобы чаще использовались уже "горячие".
+    """
+
+    _is_asyncio = True
+
+    def __init__(self, creator: Any, pool_size: int = 5, timeout: float = 30.0, **kw: Any):
+        super().__init__(creator, **kw)
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._idle: Deque[ConnectionPoolEntry] = deque()
+        self._created = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        # Пока есть ожидающие, свободное соединение не выдается в обход очереди
+        if self._idle and not self._waiters:
+            return self._idle.pop()
+
+        if self._created < self._pool_size:
+            self._created += 1
+            try:
+                return self._create_connection()
+            except BaseException:
+                self._created -= 1
+                raise
+
+        return await_only(self._wait_for_connection())
+
+    async def _wait_for_connection(self) -> ConnectionPoolEntry:
+        """Ожидание соединения в порядке очереди не дольше timeout"""
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future = loop.create_future()
+        self._waiters.append(waiter)
+        timer = loop.call_later(self._timeout, self._expire_waiter, waiter)
+
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            # Соединение уже передано, но задача отменена - возвращаем его следующему
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self._do_return_conn(waiter.result())
+            raise
+        finally:
+            timer.cancel()
+            with suppress(ValueError):
+                self._waiters.remove(waiter)
+
+    def _expire_waiter(self, waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            waiter.set_exception(
+                exc.TimeoutError(
+                    "FastAsyncPool limit of size %d reached, "
+                    "connection timed out, timeout %0.2f" % (self._pool_size, self._timeout)
+                )
+            )
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        # Соединение передается напрямую самому старому ожидающему
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(record)
+                return
+        self._idle.append(record)
+
+    def recreate(self) -> "FastAsyncPool":
+        self.logger.info("Pool recreating")
+        return self.__class__(
+            self._creator,
+            pool_size=self._pool_size,
+            timeout=self._timeout,
+            recycle=self._recycle,
+            echo=self.echo,
+            pre_ping=self._pre_ping,
+            logging_name=self._orig_logging_name,
+            reset_on_return=self._reset_on_return,
+            _dispatch=self.dispatch,
+            dialect=self._dialect,
+        )
+
+    def dispose(self) -> None:
+        closed = len(self._idle)
+        while self._idle:
+            self._idle.pop().close()
+        self._created -= closed
+        self.logger.info("Pool disposed. %s", self.status())
+
+    def status(self) -> str:
+        return (
+            "Pool size: %d  Connections in pool: %d Current Checked out connections: %d"
+            % (self.size(), self.checkedin(), self.checkedout())
+        )
+
+    def size(self) -> int:
+        return self._pool_size
+
+    def timeout(self) -> float:
+        return self._timeout
+
+    def checkedin(self) -> int:
+        return len(self._idle)
+
+    def checkedout(self) -> int:
+        return self._created - len(self._idle)
@@ -2,7 +2,8 @@ import logging
 from contextlib import asynccontextmanager
 from typing import Optional, Any, AsyncGenerator
 
-from redis.asyncio import Redis, ConnectionPool
+import orjson
+from redis.asyncio import Redis, BlockingConnectionPool
 
 from app.core.config import get_settings
 
@@ -14,7 +15,7 @@ class RedisManager:
     """Менеджер подключений к Redis"""
 
     def __init__(self):
-        self.pool: Optional[ConnectionPool] = None
+        self.pool: Optional[BlockingConnectionPool] = None
         self.client: Optional[Redis] = None
         self._initialized = False
 
@@ -25,10 +26,11 @@ class RedisManager:
             return
 
         try:
-            # Создание пула соединений
-            self.pool = ConnectionPool.from_url(
+            # Создание пула соединений (при исчерпании запросы ждут свободное соединение)
+            self.pool = BlockingConnectionPool.from_url(
                 settings.REDIS_DSN,
                 max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
                 socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
                 socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
             )
@@ -43,7 +45,7 @@ class RedisManager:
             logger.info("Redis успешно инициализирован")
 
         except Exception as e:
-            logger.error(f"Ошибка инициализации Redis: {e}")
+            logger.error("Ошибка инициализации Redis: %s", e)
             raise
 
     async def close(self):
@@ -74,7 +76,7 @@ class RedisManager:
         try:
             yield self.client
         except Exception as e:
-            logger.error(f"Ошибка Redis операции: {e}")
+            logger.error("Ошибка Redis операции: %s", e)
             raise
 
     async def health_check(self) -> bool:
@@ -84,23 +86,29 @@ class RedisManager:
                 return await self.client.ping()
             return False
         except Exception as e:
-            logger.error(f"Redis health check failed: {e}")
+            logger.error("Redis health check failed: %s", e)
             return False
 
     async def set_value(self, key: str, value: Any, expire: Optional[int] = None):
         """Установка значения в Redis"""
-        async with self.get_client_context() as client:
-            await client.set(key, value, ex=expire)
+        await self.get_client().set(key, value, ex=expire)
 
     async def get_value(self, key: str) -> Optional[Any]:
         """Получение значения из Redis"""
-        async with self.get_client_context() as client:
-            return await client.get(key)
+        return await self.get_client().get(key)
+
+    async def set_json(self, key: str, value: Any, expire: Optional[int] = None):
+        """Установка JSON-значения в Redis (сериализация через orjson)"""
+        await self.get_client().set(key, orjson.dumps(value), ex=expire)
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        """Получение JSON-значения из Redis (десериализация через orjson)"""
+        raw = await self.get_client().get(key)
+        return orjson.loads(raw) if raw is not None else None
 
     async def delete_key(self, key: str):
         """Удаление ключа из Redis"""
-        async with self.get_client_context() as client:
-            await client.delete(key)
+        await self.get_client().delete(key)
 
 
 # Глобальный экземпляр менеджера
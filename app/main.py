@@ -1,20 +1,79 @@
+import asyncio
+import atexit
 import logging
+import logging.config
+import queue
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 from fastapi import FastAPI, Depends
 from redis.asyncio import Redis
-from sqlalchemy import text
+from sqlalchemy import MetaData, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import get_settings, db_manager, get_db, redis_manager, get_redis, Base
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Логирование: записи кладутся в очередь, форматирование и вывод выполняются
+# в фоновом потоке QueueListener, а не в event loop
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 )
+log_listener = QueueListener(_log_queue, _log_stream_handler, respect_handler_level=True)
+
+logging.config.dictConfig({
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "queue": {"()": QueueHandler, "queue": _log_queue},
+    },
+    "root": {"level": "INFO", "handlers": ["queue"]},
+})
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Запрос проверки здоровья (создается один раз)
+_HEALTH_STMT = text("SELECT 1")
+
+# Количество таблиц метаданных, отсутствующих в БД (один запрос вместо проверки каждой таблицы)
+_MISSING_TABLES_STMT = text(
+    "SELECT count(*) "
+    "FROM unnest(CAST(:schemas AS text[]), CAST(:names AS text[])) AS t(schema_name, table_name) "
+    "WHERE to_regclass("
+    "quote_ident(coalesce(schema_name, current_schema())) || '.' || quote_ident(table_name)"
+    ") IS NULL"
+)
+
+
+async def create_tables(metadata: MetaData = Base.metadata):
+    """
+    Создание таблиц через metadata.create_all
+
+    Одним запросом проверяется, что все таблицы метаданных существуют; create_all
+    (запрос к pg_catalog на каждую таблицу) выполняется только если каких-то таблиц нет.
+    """
+    if not metadata.tables:
+        return
+
+    tables = list(metadata.tables.values())
+    async with db_manager.engine.connect() as conn:
+        missing = await conn.scalar(
+            _MISSING_TABLES_STMT,
+            {
+                "schemas": [table.schema for table in tables],
+                "names": [table.name for table in tables],
+            },
+        )
+    if not missing:
+        logger.info("Схема БД уже создана, create_all пропущен")
+        return
+
+    async with db_manager.engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -31,15 +90,14 @@ async def lifespan(app: FastAPI):
 
         # Создание таблиц (только для разработки)
         if settings.ENVIRONMENT == "development":
-            async with db_manager.engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
+            await create_tables()
 
         # Инициализация Redis
         await redis_manager.initialize()
 
         logger.info("Application startup complete")
     except Exception as e:
-        logger.error(f"Startup failed: {e}")
+        logger.error("Startup failed: %s", e)
         raise
 
     yield
@@ -51,7 +109,7 @@ async def lifespan(app: FastAPI):
         await redis_manager.close()
         logger.info("Application shutdown complete")
     except Exception as e:
-        logger.error(f"Shutdown error: {e}")
+        logger.error("Shutdown error: %s", e)
 
 
 # Создание приложения FastAPI
@@ -84,20 +142,19 @@ async def health_check(
         "redis": "connected",
         "environment": settings.ENVIRONMENT
     }
-    # Проверка DB
-    try:
-        await db.execute(text("SELECT 1"))
-        health_status["database"] = "connected"
-    except Exception as e:
+    # Проверка DB и Redis выполняется параллельно
+    db_result, redis_result = await asyncio.gather(
+        db.execute(_HEALTH_STMT),
+        redis.ping(),
+        return_exceptions=True,
+    )
+
+    if isinstance(db_result, BaseException):
         health_status["status"] = "degraded"
-        health_status["database"] = f"error: {str(e)}"
+        health_status["database"] = f"error: {db_result!r}"
 
-    # Проверка Redis
-    try:
-        await redis.ping()
-        health_status["redis"] = "connected"
-    except Exception as e:
+    if isinstance(redis_result, BaseException):
         health_status["status"] = "degraded"
-        health_status["redis"] = f"error: {str(e)}"
+        health_status["redis"] = f"error: {redis_result!r}"
 
     return health_status
@@ -0,0 +1,22 @@
+import unittest
+
+from app.core.config import Settings
+
+
+class SettingsTest(unittest.TestCase):
+
+    def test_dsn_follows_model_copy_update(self):
+        settings = Settings()
+        self.assertIn("@localhost:", settings.POSTGRES_DSN)
+        self.assertIn("//localhost:", settings.REDIS_DSN)
+
+        copied = settings.model_copy(
+            update={"POSTGRES_HOST": "db.prod", "REDIS_HOST": "cache.prod"}
+        )
+        self.assertIn("@db.prod:", copied.POSTGRES_DSN)
+        self.assertIn("//cache.prod:", copied.REDIS_DSN)
+        self.assertIn("@localhost:", settings.POSTGRES_DSN)
+
+
+if __name__ == "__main__":
+    unittest.main()
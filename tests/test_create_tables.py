@@ -0,0 +1,54 @@
+import unittest
+from unittest import mock
+
+from sqlalchemy import Column, Integer, MetaData, Table
+
+from app.core import db_manager
+from app.main import create_tables
+
+
+class CreateTablesTest(unittest.IsolatedAsyncioTestCase):
+    """Требует доступный PostgreSQL из настроек (POSTGRES_*)"""
+
+    async def asyncSetUp(self):
+        try:
+            await db_manager.initialize()
+        except OSError as e:
+            self.skipTest(f"PostgreSQL недоступен: {e}")
+
+        self.metadata = MetaData()
+        # Имя в смешанном регистре проверяет экранирование идентификаторов
+        Table("UserProfile", self.metadata, Column("id", Integer, primary_key=True))
+        Table("orders", self.metadata, Column("id", Integer, primary_key=True))
+
+        async with db_manager.engine.begin() as conn:
+            await conn.run_sync(self.metadata.drop_all)
+
+    async def asyncTearDown(self):
+        async with db_manager.engine.begin() as conn:
+            await conn.run_sync(self.metadata.drop_all)
+        await db_manager.close()
+
+    async def run_create_tables(self) -> mock.Mock:
+        with mock.patch.object(
+            self.metadata, "create_all", wraps=self.metadata.create_all
+        ) as create_all:
+            await create_tables(self.metadata)
+        return create_all
+
+    async def test_skips_create_all_when_all_tables_exist(self):
+        self.assertTrue((await self.run_create_tables()).called)
+
+        self.assertFalse((await self.run_create_tables()).called)
+
+    async def test_runs_create_all_when_table_is_missing(self):
+        await self.run_create_tables()
+        async with db_manager.engine.begin() as conn:
+            await conn.run_sync(self.metadata.tables["UserProfile"].drop)
+
+        self.assertTrue((await self.run_create_tables()).called)
+        self.assertFalse((await self.run_create_tables()).called)
+
+
+if __name__ == "__main__":
+    unittest.main()
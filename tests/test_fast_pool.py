@@ -0,0 +1,169 @@
+import asyncio
+import unittest
+
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.core.fast_pool import FastAsyncPool
+
+
+class StubConnection:
+    """DBAPI-соединение без реального драйвера"""
+
+    closed = False
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FastAsyncPoolTest(unittest.IsolatedAsyncioTestCase):
+
+    def make_pool(self, pool_size: int = 2, timeout: float = 0.2) -> FastAsyncPool:
+        self.created = []
+
+        def creator():
+            conn = StubConnection()
+            self.created.append(conn)
+            return conn
+
+        return FastAsyncPool(creator, pool_size=pool_size, timeout=timeout)
+
+    async def connect(self, pool: FastAsyncPool):
+        return await greenlet_spawn(pool.connect)
+
+    async def test_checkout_and_return(self):
+        pool = self.make_pool()
+        first = await self.connect(pool)
+        second = await self.connect(pool)
+        self.assertEqual(pool.checkedout(), 2)
+        self.assertEqual(pool.checkedin(), 0)
+
+        first.close()
+        second.close()
+        self.assertEqual(pool.checkedout(), 0)
+        self.assertEqual(pool.checkedin(), 2)
+
+        # Повторный checkout использует существующие соединения
+        third = await self.connect(pool)
+        self.assertEqual(len(self.created), 2)
+        third.close()
+
+    async def test_waiter_receives_returned_connection(self):
+        pool = self.make_pool(pool_size=1, timeout=1.0)
+        held = await self.connect(pool)
+
+        waiter = asyncio.create_task(self.connect(pool))
+        await asyncio.sleep(0.05)
+        self.assertFalse(waiter.done())
+
+        held.close()
+        conn = await asyncio.wait_for(waiter, 1.0)
+        self.assertEqual(pool.checkedout(), 1)
+        self.assertEqual(len(self.created), 1)
+        conn.close()
+
+    async def test_waiter_is_served_before_reacquire(self):
+        pool = self.make_pool(pool_size=1, timeout=0.3)
+        held = await self.connect(pool)
+
+        waiter = asyncio.create_task(self.connect(pool))
+        await asyncio.sleep(0.05)
+
+        # Вернувший соединение не может сразу забрать его в обход ожидающего
+        held.close()
+        barger = asyncio.create_task(self.connect(pool))
+        conn = await asyncio.wait_for(waiter, 1.0)
+        await asyncio.sleep(0.05)
+        self.assertFalse(barger.done())
+
+        conn.close()
+        (await asyncio.wait_for(barger, 1.0)).close()
+
+    async def test_release_wakes_oldest_waiter_only(self):
+        pool = self.make_pool(pool_size=1, timeout=1.0)
+        held = await self.connect(pool)
+
+        waiters = []
+        for _ in range(5):
+            waiters.append(asyncio.create_task(self.connect(pool)))
+            await asyncio.sleep(0.01)
+
+        held.close()
+        # Освобождение завершает future только одного ожидающего
+        self.assertEqual(len(pool._waiters), 4)
+        self.assertTrue(all(not w.done() for w in pool._waiters))
+        await asyncio.sleep(0.05)
+        self.assertEqual([w.done() for w in waiters], [True, False, False, False, False])
+
+        for index, waiter in enumerate(waiters):
+            conn = await asyncio.wait_for(waiter, 1.0)
+            self.assertTrue(all(not w.done() for w in waiters[index + 1:]))
+            conn.close()
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(pool.checkedin(), 1)
+
+    async def test_cancelled_waiter_is_skipped(self):
+        pool = self.make_pool(pool_size=1, timeout=1.0)
+        held = await self.connect(pool)
+
+        cancelled = asyncio.create_task(self.connect(pool))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(self.connect(pool))
+        await asyncio.sleep(0.01)
+
+        cancelled.cancel()
+        await asyncio.sleep(0.01)
+        held.close()
+
+        (await asyncio.wait_for(waiter, 1.0)).close()
+        self.assertEqual(pool.checkedin(), 1)
+        self.assertEqual(pool.checkedout(), 0)
+
+    async def test_waiter_timeout(self):
+        pool = self.make_pool(pool_size=1, timeout=0.1)
+        held = await self.connect(pool)
+
+        with self.assertRaises(exc.TimeoutError):
+            await self.connect(pool)
+        held.close()
+
+    async def test_dispose_closes_idle_connections(self):
+        pool = self.make_pool()
+        first = await self.connect(pool)
+        second = await self.connect(pool)
+        first.close()
+        second.close()
+
+        pool.dispose()
+        self.assertEqual(pool.checkedout(), 0)
+        self.assertEqual(pool.checkedin(), 0)
+        self.assertTrue(all(conn.closed for conn in self.created))
+
+        # После dispose пул снова может создавать соединения
+        third = await self.connect(pool)
+        fourth = await self.connect(pool)
+        self.assertEqual(pool.checkedout(), 2)
+        self.assertEqual(len(self.created), 4)
+        third.close()
+        fourth.close()
+
+    async def test_dispose_keeps_checked_out_connections(self):
+        pool = self.make_pool()
+        held = await self.connect(pool)
+        idle = await self.connect(pool)
+        idle.close()
+
+        pool.dispose()
+        self.assertEqual(pool.checkedout(), 1)
+
+        held.close()
+        self.assertEqual(pool.checkedout(), 0)
+        self.assertEqual(pool.checkedin(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()